@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 # benchmark.py - Performance benchmarking tool for dynamoDB implementation
 
+import aiohttp
 import argparse
+import asyncio
 import json
-import random
 import requests
 import string
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 from tqdm import tqdm
@@ -19,100 +19,85 @@ DEFAULT_PORT = 8000
 DEFAULT_WORKERS = 4
 DEFAULT_OPS = 1000
 
-def generate_random_key(length=10):
-    """Generate a random string key"""
-    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+# Character set for keys and values, as bytes so NumPy can index it directly
+CHARSET = np.frombuffer((string.ascii_lowercase + string.digits).encode("ascii"), dtype=np.uint8)
 
-def generate_random_value(length=100):
-    """Generate a random string value"""
-    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+def generate_random_strings(count, length):
+    """Generate count random strings of the given length from a single NumPy draw"""
+    idx = np.random.randint(0, len(CHARSET), size=(count, length), dtype=np.uint8)
+    raw = CHARSET[idx].tobytes().decode("ascii")
+    return [raw[i * length:(i + 1) * length] for i in range(count)]
 
-def perform_put(base_url, key, value):
-    """Perform a PUT operation and measure latency"""
+def create_session(num_workers):
+    """Create one pooled HTTP session shared by every operation of a benchmark run"""
+    # Pooled keep-alive connections avoid a TCP handshake per operation;
+    # a short connect timeout fails fast on dead nodes
+    connector = aiohttp.TCPConnector(limit=num_workers, limit_per_host=num_workers, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=5, sock_connect=1))
+
+async def perform_put(session, base_url, key, value):
+    """Perform a PUT operation and return (success, latency, status_code)"""
     data = {"value": value}
     start_time = time.time()
     try:
-        response = requests.put(
-            f"{base_url}/kv/{key}",
-            json=data,
-            headers={"Content-Type": "application/json"},
-            timeout=5
-        )
-        latency = time.time() - start_time
-        return {
-            "success": response.status_code in (200, 201),
-            "latency": latency,
-            "status_code": response.status_code
-        }
-    except Exception as e:
-        latency = time.time() - start_time
-        return {
-            "success": False,
-            "latency": latency,
-            "error": str(e)
-        }
+        async with session.put(f"{base_url}/kv/{key}", json=data) as response:
+            # Drain the body so the connection goes back to the pool
+            await response.read()
+            return response.status in (200, 201), time.time() - start_time, response.status
+    except Exception:
+        # Status 0 marks a transport-level failure (no HTTP response)
+        return False, time.time() - start_time, 0
 
-def perform_get(base_url, key):
-    """Perform a GET operation and measure latency"""
+async def perform_get(session, base_url, key):
+    """Perform a GET operation and return (success, latency, status_code)"""
     start_time = time.time()
     try:
-        response = requests.get(
-            f"{base_url}/kv/{key}",
-            timeout=5
-        )
-        latency = time.time() - start_time
-        return {
-            "success": response.status_code == 200,
-            "latency": latency,
-            "status_code": response.status_code
-        }
-    except Exception as e:
-        latency = time.time() - start_time
-        return {
-            "success": False,
-            "latency": latency,
-            "error": str(e)
-        }
+        async with session.get(f"{base_url}/kv/{key}") as response:
+            await response.read()
+            return response.status == 200, time.time() - start_time, response.status
+    except Exception:
+        return False, time.time() - start_time, 0
+
+async def run_bounded(operations, num_workers, desc):
+    """Await the given coroutines with at most num_workers in flight, storing results in arrays by submission order"""
+    latencies = np.empty(len(operations), dtype=np.float64)
+    successes = np.empty(len(operations), dtype=np.bool_)
+    status_codes = np.empty(len(operations), dtype=np.int16)
+    sem = asyncio.Semaphore(num_workers)
+
+    async def bounded(i, op):
+        async with sem:
+            return i, await op
 
-def run_write_benchmark(base_url, num_operations, num_workers):
+    # Drain results in completion order so the progress bar tracks the real completion rate
+    tasks = [bounded(i, op) for i, op in enumerate(operations)]
+    for next_done in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc=desc):
+        i, (success, latency, status_code) = await next_done
+        successes[i] = success
+        latencies[i] = latency
+        status_codes[i] = status_code
+    
+    return {"latencies": latencies, "successes": successes, "status_codes": status_codes}
+
+async def run_write_benchmark(session, base_url, num_operations, num_workers):
     """Run a write benchmark with the specified number of operations and workers"""
     print(f"Running write benchmark with {num_operations} operations using {num_workers} workers")
     
     # Generate keys and values in advance
-    keys = [generate_random_key() for _ in range(num_operations)]
-    values = [generate_random_value() for _ in range(num_operations)]
-    
-    results = []
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        # Use tqdm to display a progress bar
-        futures = []
-        for i in range(num_operations):
-            future = executor.submit(perform_put, base_url, keys[i], values[i])
-            futures.append(future)
-        
-        for future in tqdm(futures, total=num_operations, desc="PUT Operations"):
-            results.append(future.result())
+    keys = generate_random_strings(num_operations, 10)
+    values = generate_random_strings(num_operations, 100)
     
-    return results
+    operations = [perform_put(session, base_url, keys[i], values[i]) for i in range(num_operations)]
+    return await run_bounded(operations, num_workers, "PUT Operations")
 
-def run_read_benchmark(base_url, keys, num_workers):
+async def run_read_benchmark(session, base_url, keys, num_workers):
     """Run a read benchmark for the specified keys using the specified number of workers"""
     print(f"Running read benchmark for {len(keys)} keys using {num_workers} workers")
     
-    results = []
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        # Use tqdm to display a progress bar
-        futures = []
-        for key in keys:
-            future = executor.submit(perform_get, base_url, key)
-            futures.append(future)
-        
-        for future in tqdm(futures, total=len(keys), desc="GET Operations"):
-            results.append(future.result())
-    
-    return results
+    operations = [perform_get(session, base_url, key) for key in keys]
+    return await run_bounded(operations, num_workers, "GET Operations")
 
-def run_mixed_benchmark(base_url, num_operations, read_percentage, num_workers):
+async def run_mixed_benchmark(session, base_url, num_operations, read_percentage, num_workers):
     """Run a mixed read/write benchmark with the specified operations, read percentage and workers"""
     print(f"Running mixed benchmark with {num_operations} operations " + 
           f"({read_percentage}% reads) using {num_workers} workers")
@@ -123,33 +108,20 @@ def run_mixed_benchmark(base_url, num_operations, read_percentage, num_workers):
     
     # First, perform writes to establish data
     print("Phase 1: Establishing data with write operations")
-    keys = [generate_random_key() for _ in range(num_writes)]
-    values = [generate_random_value() for _ in range(num_writes)]
+    keys = generate_random_strings(num_writes, 10)
+    values = generate_random_strings(num_writes, 100)
     
-    write_results = []
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        for i in range(num_writes):
-            future = executor.submit(perform_put, base_url, keys[i], values[i])
-            futures.append(future)
-        
-        for future in tqdm(futures, total=num_writes, desc="Initial PUT Operations"):
-            write_results.append(future.result())
+    operations = [perform_put(session, base_url, keys[i], values[i]) for i in range(num_writes)]
+    write_results = await run_bounded(operations, num_workers, "Initial PUT Operations")
     
     # Now perform the mixed workload (all reads in this case, since we did writes already)
     print("Phase 2: Performing read operations")
     # Randomly select keys for reads (with replacement to simulate real-world access patterns)
-    read_keys = random.choices(keys, k=num_reads)
+    keys_arr = np.array(keys)
+    read_keys = keys_arr[np.random.randint(0, len(keys), size=num_reads)].tolist()
     
-    read_results = []
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        for key in read_keys:
-            future = executor.submit(perform_get, base_url, key)
-            futures.append(future)
-        
-        for future in tqdm(futures, total=num_reads, desc="GET Operations"):
-            read_results.append(future.result())
+    operations = [perform_get(session, base_url, key) for key in read_keys]
+    read_results = await run_bounded(operations, num_workers, "GET Operations")
     
     # Combine results
     return {
@@ -170,7 +142,7 @@ def analyze_results(results, benchmark_type):
         analyze_single_results(read_results)
         
         print("\n===== COMBINED STATISTICS =====")
-        all_results = write_results + read_results
+        all_results = {name: np.concatenate([write_results[name], read_results[name]]) for name in write_results}
         analyze_single_results(all_results)
         
         return
@@ -179,27 +151,24 @@ def analyze_results(results, benchmark_type):
 
 def analyze_single_results(results):
     """Analyze a single set of benchmark results"""
-    # Extract latencies
-    latencies = [r["latency"] for r in results]
+    latencies = results["latencies"]
     
     # Calculate success rate
-    success_count = sum(1 for r in results if r["success"])
-    success_rate = (success_count / len(results)) * 100
+    success_rate = results["successes"].mean() * 100 if len(latencies) else 0.0
     
     # Calculate statistics
-    if latencies:
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
+    if len(latencies):
+        # One reduction feeds both the average and the throughput estimate
+        total_time = latencies.sum()
+        avg_latency = total_time / len(latencies)
+        min_latency = latencies.min()
+        max_latency = latencies.max()
         
-        # Calculate percentiles
-        p50 = np.percentile(latencies, 50)
-        p90 = np.percentile(latencies, 90)
-        p95 = np.percentile(latencies, 95)
-        p99 = np.percentile(latencies, 99)
+        # Calculate percentiles (a single call partitions the data once)
+        p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
         
         # Print summary
-        print(f"Total operations: {len(results)}")
+        print(f"Total operations: {len(latencies)}")
         print(f"Success rate: {success_rate:.2f}%")
         print(f"Average latency: {avg_latency*1000:.2f} ms")
         print(f"Min latency: {min_latency*1000:.2f} ms")
@@ -210,9 +179,8 @@ def analyze_single_results(results):
         print(f"99th percentile: {p99*1000:.2f} ms")
         
         # Calculate throughput
-        total_time = sum(latencies)
         if total_time > 0:
-            ops_per_second = len(results) / total_time
+            ops_per_second = len(latencies) / total_time
             print(f"Estimated throughput: {ops_per_second:.2f} operations/second")
     else:
         print("No latency data available.")
@@ -222,14 +190,14 @@ def plot_latency_distribution(results, benchmark_type, output_file=None):
     plt.figure(figsize=(10, 6))
     
     if benchmark_type == "mixed":
-        write_latencies = [r["latency"] * 1000 for r in results["writes"]]
-        read_latencies = [r["latency"] * 1000 for r in results["reads"]]
+        write_latencies = results["writes"]["latencies"] * 1000
+        read_latencies = results["reads"]["latencies"] * 1000
         
         plt.hist(write_latencies, alpha=0.5, label="Write Latencies", bins=20)
         plt.hist(read_latencies, alpha=0.5, label="Read Latencies", bins=20)
         plt.legend()
     else:
-        latencies = [r["latency"] * 1000 for r in results]
+        latencies = results["latencies"] * 1000
         plt.hist(latencies, bins=20)
     
     plt.title("Operation Latency Distribution")
@@ -248,14 +216,14 @@ def plot_latency_over_time(results, benchmark_type, output_file=None):
     plt.figure(figsize=(12, 6))
     
     if benchmark_type == "mixed":
-        write_latencies = [r["latency"] * 1000 for r in results["writes"]]
-        read_latencies = [r["latency"] * 1000 for r in results["reads"]]
+        write_latencies = results["writes"]["latencies"] * 1000
+        read_latencies = results["reads"]["latencies"] * 1000
         
         plt.plot(range(len(write_latencies)), write_latencies, 'b-', alpha=0.5, label="Write Latencies")
         plt.plot(range(len(read_latencies)), read_latencies, 'r-', alpha=0.5, label="Read Latencies")
         plt.legend()
     else:
-        latencies = [r["latency"] * 1000 for r in results]
+        latencies = results["latencies"] * 1000
         plt.plot(range(len(latencies)), latencies, 'g-', alpha=0.7)
     
     plt.title("Latency Over Operation Sequence")
@@ -292,6 +260,31 @@ def check_cluster_health(base_url):
         print(f"Warning: Cluster health check failed: {str(e)}")
         return False
 
+async def run_benchmark(args, base_url):
+    """Run the benchmark selected on the command line over a single shared session"""
+    async with create_session(args.workers) as session:
+        if args.type == "write":
+            results = await run_write_benchmark(session, base_url, args.operations, args.workers)
+            return results, "write"
+        
+        if args.type == "read":
+            # For read benchmarks, we need to first write data to read
+            print("First writing data that will be read during benchmark...")
+            keys = generate_random_strings(args.operations, 10)
+            values = generate_random_strings(args.operations, 100)
+            
+            # Reuse the bounded concurrent runner so preparation isn't one request at a time
+            operations = [perform_put(session, base_url, keys[i], values[i]) for i in range(args.operations)]
+            await run_bounded(operations, args.workers, "Preparing data")
+            
+            # Now run the read benchmark
+            results = await run_read_benchmark(session, base_url, keys, args.workers)
+            return results, "read"
+        
+        # mixed
+        results = await run_mixed_benchmark(session, base_url, args.operations, args.read_pct, args.workers)
+        return results, "mixed"
+
 def main():
     parser = argparse.ArgumentParser(description="Benchmark tool for DynamoDB implementation")
     parser.add_argument("--host", default=DEFAULT_HOST, help=f"Host (default: {DEFAULT_HOST})")
@@ -322,24 +315,7 @@ def main():
     start_time = time.time()
     
     # Run the requested benchmark
-    if args.type == "write":
-        results = run_write_benchmark(base_url, args.operations, args.workers)
-        benchmark_type = "write"
-    elif args.type == "read":
-        # For read benchmarks, we need to first write data to read
-        print("First writing data that will be read during benchmark...")
-        keys = [generate_random_key() for _ in range(args.operations)]
-        values = [generate_random_value() for _ in range(args.operations)]
-        
-        for i in tqdm(range(args.operations), desc="Preparing data"):
-            perform_put(base_url, keys[i], values[i])
-        
-        # Now run the read benchmark
-        results = run_read_benchmark(base_url, keys, args.workers)
-        benchmark_type = "read"
-    else:  # mixed
-        results = run_mixed_benchmark(base_url, args.operations, args.read_pct, args.workers)
-        benchmark_type = "mixed"
+    results, benchmark_type = asyncio.run(run_benchmark(args, base_url))
     
     end_time = time.time()
     total_time = end_time - start_time
@@ -2,6 +2,7 @@
 import os
 import time
 import subprocess
+import requests
 import matplotlib.pyplot as plt
 import simulate_scale
 
@@ -10,13 +11,43 @@ NUM_NODES = 4
 KEYS = 500
 WORKERS = 10
 CLUSTER_SCRIPT = "./run_cluster.sh"
+READY_TIMEOUT = 30      # Max seconds to wait for the cluster to come up
+READY_POLL_INTERVAL = 0.2
+
+def cluster_converged(node_url, expected_nodes):
+    """True once node_url answers and has heard a gossip heartbeat from every node"""
+    resp = requests.get(f"{node_url}/admin/cluster", timeout=1)
+    # The response maps each node ID to its gossip state. Peers start out listed as alive with
+    # heartbeat 0 before they are even up, so only a heartbeat above 0 shows gossip got through
+    members = resp.json().values()
+    heard = sum(1 for m in members if m.get("status") == "alive" and m.get("heartbeat", 0) > 0)
+    return heard >= expected_nodes
+
+def wait_ready(node_urls, timeout=READY_TIMEOUT):
+    """Poll every node's /admin/cluster until all of them have converged, or give up after timeout seconds"""
+    deadline = time.time() + timeout
+    pending = list(node_urls)
+    while time.time() < deadline:
+        still_pending = []
+        for url in pending:
+            try:
+                if cluster_converged(url, len(node_urls)):
+                    continue
+            except Exception:
+                pass
+            still_pending.append(url)
+        pending = still_pending
+        if not pending:
+            return True
+        time.sleep(READY_POLL_INTERVAL)
+    return False
 
 def run_benchmark(n, r, w):
     print(f"\n\n📊 Benchmarking Configuration: N={n}, R={r}, W={w}")
     
     # 1. Stop existing cluster
+    # The stop script already waits for (and force-kills) the old processes
     subprocess.run([CLUSTER_SCRIPT, "stop"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    time.sleep(2)
     
     # 2. Start cluster with new config
     env = os.environ.copy()
@@ -29,8 +60,9 @@ def run_benchmark(n, r, w):
     subprocess.run([CLUSTER_SCRIPT], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     
     # Wait for cluster to stabilize
-    print("   Waiting 15s for cluster stabilization...")
-    time.sleep(15)
+    print(f"   Waiting up to {READY_TIMEOUT}s for cluster stabilization...")
+    if not wait_ready(simulate_scale.get_node_urls(NUM_NODES)):
+        print("   ⚠️  Not every node had heard gossip from the whole cluster in time, running anyway")
     
     # 3. Run simulation
     print("   Running workload...")
@@ -9,6 +9,7 @@ import (
 	"os"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/gorilla/mux"
@@ -16,6 +17,13 @@ import (
 
 var coordinator *Coordinator
 
+const (
+	// Largest ops/keys list a single batch request may carry
+	maxBatchKeys = 1024
+	// Keys of one batch request resolved at a time; each one is a full quorum fan-out
+	batchConcurrency = 16
+)
+
 // getPortForNode maps a node ID to its port
 func getPortForNode(nodeID string) int {
 	switch nodeID {
@@ -160,6 +168,8 @@ func main() {
 	r := mux.NewRouter()
 
 	// Public endpoints
+	r.HandleFunc("/kv/batch", BatchPutHandler).Methods("POST")
+	r.HandleFunc("/kv/mget", MultiGetHandler).Methods("POST")
 	r.HandleFunc("/kv/{key}", GetHandler).Methods("GET")
 	r.HandleFunc("/kv/{key}", PutHandler).Methods("PUT")
 
@@ -301,6 +311,119 @@ func PutHandler(w http.ResponseWriter, r *http.Request) {
 	w.Write(append(js, '\n'))
 }
 
+// BatchPutHandler stores several keys in one request so clients can amortize
+// the HTTP round trip. Each key goes through the normal quorum write path and
+// gets its own entry in the response, in request order.
+func BatchPutHandler(w http.ResponseWriter, r *http.Request) {
+	// Ops are decoded as maps so that, as in PutHandler, an explicit null value is
+	// stored and only a missing value is rejected
+	var body struct {
+		Ops []map[string]interface{} `json:"ops"`
+	}
+	if err := json.NewDecoder(r.Body).Decode(&body); err != nil {
+		http.Error(w, "Invalid JSON body", http.StatusBadRequest)
+		return
+	}
+	if len(body.Ops) > maxBatchKeys {
+		http.Error(w, fmt.Sprintf("Too many ops in one batch (max %d)", maxBatchKeys), http.StatusBadRequest)
+		return
+	}
+
+	textLog(coordinator.NodeID, "PUBLIC", "Processing batch PUT request for %d keys", len(body.Ops))
+	results := make([]map[string]interface{}, len(body.Ops))
+	sem := make(chan struct{}, batchConcurrency)
+	var wg sync.WaitGroup
+	for i, op := range body.Ops {
+		key, _ := op["key"].(string)
+		value, hasValue := op["value"]
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, key string, value interface{}, hasValue bool) {
+			defer wg.Done()
+			defer func() { <-sem }()
+			result := map[string]interface{}{"key": key, "status": "stored"}
+			if key == "" || !hasValue {
+				result["status"] = "error"
+				result["error"] = "Key and value are required"
+			} else if err := coordinator.Put(key, value); err != nil {
+				result["status"] = "error"
+				result["error"] = err.Error()
+			}
+			results[i] = result
+		}(i, key, value, hasValue)
+	}
+	wg.Wait()
+
+	js, err := json.Marshal(map[string]interface{}{
+		"results": results,
+		"node":    coordinator.NodeID,
+	})
+	if err != nil {
+		http.Error(w, "Failed to marshal response", http.StatusInternalServerError)
+		return
+	}
+	w.Header().Set("Content-Type", "application/json")
+	w.Write(append(js, '\n'))
+}
+
+// MultiGetHandler reads several keys in one request. Each key is resolved like
+// GetHandler, including the local fallback, and reported with its own status.
+func MultiGetHandler(w http.ResponseWriter, r *http.Request) {
+	var body struct {
+		Keys []string `json:"keys"`
+	}
+	if err := json.NewDecoder(r.Body).Decode(&body); err != nil {
+		http.Error(w, "Invalid JSON body", http.StatusBadRequest)
+		return
+	}
+
+	if len(body.Keys) > maxBatchKeys {
+		http.Error(w, fmt.Sprintf("Too many keys in one batch (max %d)", maxBatchKeys), http.StatusBadRequest)
+		return
+	}
+
+	textLog(coordinator.NodeID, "PUBLIC", "Processing multi-GET request for %d keys", len(body.Keys))
+	results := make([]map[string]interface{}, len(body.Keys))
+	sem := make(chan struct{}, batchConcurrency)
+	var wg sync.WaitGroup
+	for i, key := range body.Keys {
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, key string) {
+			defer wg.Done()
+			defer func() { <-sem }()
+			result, err := coordinator.Get(key)
+			if err != nil {
+				localValue := coordinator.localGet(key)
+				if localValue.Value == nil {
+					results[i] = map[string]interface{}{"key": key, "status": "error", "error": err.Error()}
+					return
+				}
+				result = coordinator.formatResult(localValue, 0)
+			}
+			if result["value"] == nil {
+				results[i] = map[string]interface{}{"key": key, "status": "not_found"}
+				return
+			}
+			result["key"] = key
+			result["status"] = "found"
+			results[i] = result
+		}(i, key)
+	}
+	wg.Wait()
+
+	js, err := json.Marshal(map[string]interface{}{
+		"results": results,
+		"node":    coordinator.NodeID,
+	})
+	if err != nil {
+		http.Error(w, "Failed to marshal response", http.StatusInternalServerError)
+		return
+	}
+	w.Header().Set("Content-Type", "application/json")
+	w.Write(append(js, '\n'))
+}
+
 // InternalGetHandler handles internal GET requests from other nodes
 func InternalGetHandler(w http.ResponseWriter, r *http.Request) {
 	vars := mux.Vars(r)
@@ -15,16 +15,20 @@ This script assumes the cluster is already running.
 """
 
 import argparse
-import random
+import asyncio
 import string
 import time
-import requests
+import aiohttp
+import numpy as np
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 # Configuration
 BASE_PORT = 8000
+BATCH_SIZE = 128  # Keys per /kv/batch or /kv/mget request
+MAX_BATCH_SIZE = 1024  # The nodes reject larger batches with 400 (maxBatchKeys in main.go)
+# A batch carries many quorum operations, so it gets a longer budget than a single op
+BATCH_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=1)
 
 def generate_key(index):
     """Generate a deterministic but distributed key based on index"""
@@ -33,89 +37,131 @@ def generate_key(index):
     suffix = (index * 2654435761) % 10000 # Knuth's multiplicative hash
     return f"key-{index}-{suffix}"
 
-def generate_value(size_bytes=100):
-    """Generate a random string value"""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=size_bytes))
+# Character set for values, as bytes so NumPy can index it directly
+CHARSET = np.frombuffer((string.ascii_letters + string.digits).encode("ascii"), dtype=np.uint8)
 
-def get_random_node_url(num_nodes):
-    """Pick a random node from the cluster to send the request to"""
+def generate_values(count, size_bytes=100):
+    """Generate count random string values from a single NumPy draw"""
+    idx = np.random.randint(0, len(CHARSET), size=(count, size_bytes), dtype=np.uint8)
+    raw = CHARSET[idx].tobytes().decode("ascii")
+    return [raw[i * size_bytes:(i + 1) * size_bytes] for i in range(count)]
+
+def get_node_urls(num_nodes):
+    """Build the base URL of every node in the cluster once"""
+    return [f"http://localhost:{BASE_PORT + i}" for i in range(num_nodes)]
+
+def pick_random_nodes(num_nodes, count):
+    """Pick a random target node index for each of count requests in one draw"""
     # In a real client, we might be smarter, but a load balancer 
     # or random selection is a standard strategy
-    port = BASE_PORT + random.randint(0, num_nodes - 1)
-    return f"http://localhost:{port}"
-
-def perform_put(node_url, key, value):
+    return np.random.randint(0, num_nodes, size=count)
+
+def create_session(num_workers):
+    """Create one pooled HTTP session shared by every request of a run"""
+    # Pooled keep-alive connections avoid a TCP handshake per operation;
+    # a short connect timeout fails fast on dead nodes
+    connector = aiohttp.TCPConnector(limit=num_workers, limit_per_host=num_workers, keepalive_timeout=30)
+    # Short timeout for high throughput
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=2, sock_connect=1))
+
+def chunks(items, size):
+    """Lazily split a sequence into consecutive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+async def run_worker_pool(handler, items, num_workers, **tqdm_kwargs):
+    """Feed items to num_workers consumer tasks and return the sum of handler results"""
+    # Workers pull from one shared iterator, so at most num_workers requests are in
+    # flight and no per-item coroutine or future is created up front
+    pending = iter(items)
+    progress = tqdm(**tqdm_kwargs)
+    total = 0
+
+    async def worker():
+        nonlocal total
+        for item in pending:
+            # Await before touching total so concurrent workers don't lose updates
+            count = await handler(item)
+            total += count
+            progress.update(1)
+
+    await asyncio.gather(*[worker() for _ in range(num_workers)])
+    progress.close()
+    return total
+
+async def perform_put_batch(session, node_url, kv_pairs):
+    """Write a batch of (key, value) pairs in one request and return how many were stored"""
+    ops = [{"key": key, "value": value} for key, value in kv_pairs]
     try:
-        resp = requests.put(
-            f"{node_url}/kv/{key}",
-            json={"value": value},
-            headers={"Content-Type": "application/json"},
-            timeout=2  # Short timeout for high throughput
-        )
-        return resp.status_code in (200, 201)
+        async with session.post(f"{node_url}/kv/batch", json={"ops": ops}, timeout=BATCH_TIMEOUT) as resp:
+            if resp.status != 200:
+                await resp.read()
+                return 0
+            body = await resp.json()
+            return sum(1 for r in body.get("results", []) if r.get("status") == "stored")
     except Exception:
-        return False
+        return 0
 
-def perform_get(node_url, key):
+async def perform_get_batch(session, node_url, keys):
+    """Read a batch of keys in one request and return how many were found"""
     try:
-        resp = requests.get(
-            f"{node_url}/kv/{key}",
-            timeout=2
-        )
-        return resp.status_code == 200
+        async with session.post(f"{node_url}/kv/mget", json={"keys": keys}, timeout=BATCH_TIMEOUT) as resp:
+            if resp.status != 200:
+                await resp.read()
+                return 0
+            body = await resp.json()
+            return sum(1 for r in body.get("results", []) if r.get("status") == "found")
     except Exception:
-        return False
+        return 0
 
-def run_simulation(num_nodes, num_keys, num_workers, value_size):
+async def run_simulation_async(num_nodes, num_keys, num_workers, value_size, batch_size=BATCH_SIZE):
     print("🚀 Starting Scale Simulation")
     print(f"   Target Cluster: {num_nodes} nodes (Ports {BASE_PORT}-{BASE_PORT+num_nodes-1})")
     print(f"   Key Space:      {num_keys:,} keys")
     print(f"   Concurrency:    {num_workers} workers")
+    print(f"   Batch Size:     {batch_size} keys/request")
     print("-" * 60)
 
-    # 1. WRITE PHASE
-    print(f"\n📝 Phase 1: Writing {num_keys:,} keys...")
-    start_time = time.time()
-    success_writes = 0
-    
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        # Submit all tasks
-        for i in range(num_keys):
-            key = generate_key(i)
-            val = generate_value(value_size)
-            url = get_random_node_url(num_nodes)
-            futures.append(executor.submit(perform_put, url, key, val))
-        
-        # Process results as they complete
-        for f in tqdm(as_completed(futures), total=num_keys, unit="ops"):
-            if f.result():
-                success_writes += 1
-    
-    write_duration = time.time() - start_time
-    print(f"   ✅ Writes Completed: {success_writes}/{num_keys} ({success_writes/num_keys*100:.1f}%)")
-    print(f"   ⏱️  Duration: {write_duration:.2f}s ({success_writes/write_duration:.1f} ops/sec)")
-
-    # 2. READ PHASE
-    print(f"\n📖 Phase 2: Reading {num_keys:,} keys...")
-    start_time = time.time()
-    success_reads = 0
-    
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        for i in range(num_keys):
-            key = generate_key(i)
+    # A single pooled session keeps connections alive across both phases
+    async with create_session(num_workers) as session:
+        num_batches = (num_keys + batch_size - 1) // batch_size
+        node_urls = get_node_urls(num_nodes)
+        write_picks = pick_random_nodes(num_nodes, num_batches)
+        read_picks = pick_random_nodes(num_nodes, num_batches)
+
+        async def put_batch(batch):
+            values = generate_values(len(batch), value_size)
+            kv_pairs = [(generate_key(i), val) for i, val in zip(batch, values)]
+            url = node_urls[write_picks[batch.start // batch_size]]
+            return await perform_put_batch(session, url, kv_pairs)
+
+        async def get_batch(batch):
             # We don't need the value for GET, just the key
-            url = get_random_node_url(num_nodes)
-            futures.append(executor.submit(perform_get, url, key))
+            keys = [generate_key(i) for i in batch]
+            url = node_urls[read_picks[batch.start // batch_size]]
+            return await perform_get_batch(session, url, keys)
+
+        # 1. WRITE PHASE
+        print(f"\n📝 Phase 1: Writing {num_keys:,} keys...")
+        start_time = time.time()
+        
+        success_writes = await run_worker_pool(put_batch, chunks(range(num_keys), batch_size), num_workers,
+                                               total=num_batches, unit="batches")
         
-        for f in tqdm(as_completed(futures), total=num_keys, unit="ops"):
-            if f.result():
-                success_reads += 1
+        write_duration = time.time() - start_time
+        print(f"   ✅ Writes Completed: {success_writes}/{num_keys} ({success_writes/num_keys*100:.1f}%)")
+        print(f"   ⏱️  Duration: {write_duration:.2f}s ({success_writes/write_duration:.1f} ops/sec)")
 
-    read_duration = time.time() - start_time
-    print(f"   ✅ Reads Completed: {success_reads}/{num_keys} ({success_reads/num_keys*100:.1f}%)")
-    print(f"   ⏱️  Duration: {read_duration:.2f}s ({success_reads/read_duration:.1f} ops/sec)")
+        # 2. READ PHASE
+        print(f"\n📖 Phase 2: Reading {num_keys:,} keys...")
+        start_time = time.time()
+        
+        success_reads = await run_worker_pool(get_batch, chunks(range(num_keys), batch_size), num_workers,
+                                              total=num_batches, unit="batches")
+
+        read_duration = time.time() - start_time
+        print(f"   ✅ Reads Completed: {success_reads}/{num_keys} ({success_reads/num_keys*100:.1f}%)")
+        print(f"   ⏱️  Duration: {read_duration:.2f}s ({success_reads/read_duration:.1f} ops/sec)")
 
     return {
         "write_ops_sec": success_writes / write_duration if write_duration > 0 else 0,
@@ -124,13 +170,20 @@ def run_simulation(num_nodes, num_keys, num_workers, value_size):
         "read_success_rate": success_reads / num_keys
     }
 
+def run_simulation(num_nodes, num_keys, num_workers, value_size, batch_size=BATCH_SIZE):
+    """Blocking entry point that drives the async simulation on a fresh event loop"""
+    return asyncio.run(run_simulation_async(num_nodes, num_keys, num_workers, value_size, batch_size))
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DynamoDB Scale Simulator")
     parser.add_argument("--nodes", type=int, default=4, help="Number of nodes in the running cluster")
     parser.add_argument("--keys", type=int, default=1000, help="Number of keys to simulate")
-    parser.add_argument("--workers", type=int, default=10, help="Number of concurrent threads")
+    parser.add_argument("--workers", type=int, default=10, help="Number of concurrent requests")
     parser.add_argument("--size", type=int, default=100, help="Size of value in bytes")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Number of keys per batched request")
     
     args = parser.parse_args()
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
     
-    run_simulation(args.nodes, args.keys, args.workers, args.size)
+    run_simulation(args.nodes, args.keys, args.workers, args.size, args.batch_size)
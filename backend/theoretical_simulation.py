@@ -1,8 +1,26 @@
 #!/usr/bin/env python3
 import numpy as np
-import matplotlib.pyplot as plt
-import time
-from tqdm import tqdm
+import math
+import functools
+import hashlib
+import warnings
+from statistics import NormalDist
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Numba is optional: when present, replica delays are drawn and clipped in one fused kernel
+try:
+    from numba import njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# CuPy is optional too: when a CUDA device is available, large-N grids run on the GPU
+try:
+    import cupy as cp
+    HAVE_CUPY = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    HAVE_CUPY = False
 
 # Simulation Constants
 CLUSTER_SIZE = 1000
@@ -32,63 +50,196 @@ FANOUT_COST_PER_NODE = 0.01
 TIMEOUT_MS = 1000.0       # 1 second timeout if quorum cannot be reached
 CLIENT_RETRY_DELAY = 50.0 # 50ms penalty if coordinator fails and client retries
 
-def simulate_latency(n, quorum_size, op_type="write", num_ops=1000, node_failure_rate=0.0, coord_failure_rate=0.0):
+# When True, latencies come from the closed-form order statistic model in analytical_latency
+# instead of the Monte Carlo; keep it False to validate against or regenerate the simulated graphs
+ANALYTICAL_MODEL = False
+
+# Simulated delays only carry ~1ms precision, so the Monte Carlo arrays are float32
+# (half the memory traffic of float64); means are still accumulated in float64
+SIM_DTYPE = np.float32
+RNG = np.random.default_rng()
+
+# Root seed of the cached Monte Carlo runs: each config reseeds from it and its own arguments
+# (see seed_config), so a cached result is the one a fresh run of that config gives, whatever
+# ran before it and whichever pool worker runs it
+SEED = 42
+# Rows of a Numba delay draw that share one reseed of the kernel's RNG; the row blocks are fixed,
+# so the draw does not depend on how the blocks are spread over threads
+ROWS_PER_SEED = 64
+
+# np.partition only uses the vectorized (AVX2/AVX-512) introselect for contiguous float32
+# rows from NumPy 1.26 on; older releases fall back to the scalar selection
+if tuple(int(part) for part in np.__version__.split(".")[:2]) < (1, 26):
+    warnings.warn(f"NumPy {np.__version__} has no vectorized partition; the quorum selection "
+                  "will be noticeably slower than on NumPy >= 1.26", RuntimeWarning)
+
+# The heap kernel only pays off for a handful of heap slots on wide rows; elsewhere the
+# in-place partition is faster
+HEAP_SELECT_MAX_SIZE = 4
+HEAP_SELECT_MIN_N = 500
+
+# Smallest replica count worth the host/device round trip
+GPU_MIN_N = 500
+
+# Reusable delay buffers, grown on demand. They are kept flat so that the (num_ops, n)
+# view of any config stays C-contiguous, which the Generator's out= requires. C order also
+# keeps each trial's n replica delays adjacent, so the axis=1 quorum partition walks
+# contiguous memory; a transposed (n, num_ops) or Fortran layout would not make it cheaper
+SIM_BUFFERS = {}
+
+def sim_buffer(name, num_ops, n):
+    """Returns a contiguous (num_ops, n) SIM_DTYPE view into the named reusable buffer."""
+    size = num_ops * n
+    buf = SIM_BUFFERS.get(name)
+    if buf is None or buf.size < size:
+        buf = SIM_BUFFERS[name] = np.empty(size, dtype=SIM_DTYPE)
+    return buf[:size].reshape(num_ops, n)
+
+if HAVE_NUMBA:
+    # Same model as the NumPy path in draw_replica_delays, but each (trial, replica) delay is
+    # produced in registers and written once instead of going through several full-array passes.
+    # Numba's RNG state is per thread, so every block of ROWS_PER_SEED rows reseeds it from
+    # block_seeds to stay reproducible whichever thread runs the block
+    @njit(parallel=True, fastmath=True, cache=True)
+    def fill_delays_numba(out, disk_mean, disk_std, block_seeds):
+        num_ops, n = out.shape
+        for b in prange(block_seeds.shape[0]):
+            np.random.seed(block_seeds[b])
+            for i in range(b * ROWS_PER_SEED, min((b + 1) * ROWS_PER_SEED, num_ops)):
+                for j in range(n):
+                    net = max(np.random.normal(NETWORK_MEAN, NETWORK_STD), 1.0)
+                    disk = max(np.random.normal(disk_mean, disk_std), 0.5)
+                    out[i, j] = net + disk
+
+    # Applies a failure mask to already drawn delays without materializing the boolean array,
+    # counting each trial's live replicas on the way
+    @njit(parallel=True, cache=True)
+    def mask_failed_numba(out, draws, node_failure_rate):
+        num_ops, n = out.shape
+        alive_count = np.empty(num_ops, dtype=np.int64)
+        for i in prange(num_ops):
+            alive = 0
+            for j in range(n):
+                if draws[i, j] < node_failure_rate:
+                    out[i, j] = TIMEOUT_MS
+                else:
+                    alive += 1
+            alive_count[i] = alive
+        return alive_count
+
+    # Heap selection of the k-th smallest delay per trial. One pass over the row with a tiny
+    # heap beats introselect when k is close to 1 or to n on wide rows, and the row is left as is
+    @njit(parallel=True, fastmath=True, cache=True)
+    def kth_smallest_numba(delays, k):
+        num_ops, n = delays.shape
+        # Keep whichever side of the k-th element is smaller in a heap: the k smallest in a
+        # max-heap, or the n - k + 1 largest in a min-heap (stored negated so one sift works)
+        flip = k > n - k + 1
+        size = n - k + 1 if flip else k
+        sign = -1.0 if flip else 1.0
+        out = np.empty(num_ops, dtype=delays.dtype)
+        for i in prange(num_ops):
+            heap = np.empty(size, dtype=delays.dtype)
+            for j in range(n):
+                v = sign * delays[i, j]
+                if j < size:
+                    # Sift up
+                    c = j
+                    heap[c] = v
+                    while c > 0:
+                        p = (c - 1) // 2
+                        if heap[p] >= heap[c]:
+                            break
+                        heap[p], heap[c] = heap[c], heap[p]
+                        c = p
+                elif v < heap[0]:
+                    # Replace the root and sift down
+                    heap[0] = v
+                    p = 0
+                    while True:
+                        c = 2 * p + 1
+                        if c >= size:
+                            break
+                        if c + 1 < size and heap[c + 1] > heap[c]:
+                            c += 1
+                        if heap[p] >= heap[c]:
+                            break
+                        heap[p], heap[c] = heap[c], heap[p]
+                        p = c
+            out[i] = sign * heap[0]
+        return out
+
+def draw_replica_delays(n, num_ops, op_type="write"):
     """
-    Simulates the latency of an operation that requires 'quorum_size' acks from 'n' replicas.
-    Returns the average latency over num_ops.
+    Draws the healthy response delay of each of the 'n' replicas for 'num_ops' trials.
+    Returns a (num_ops, n) view into the reusable "net" buffer.
     """
+    # Disk Processing parameters
+    if op_type == "write":
+        disk_mean, disk_std = WRITE_DISK_MEAN, WRITE_DISK_STD
+    else:
+        disk_mean, disk_std = READ_DISK_MEAN, READ_DISK_STD
+
     # Generate latencies for all N replicas across all trials at once
     # Shape: (num_ops, n)
-    
+    if HAVE_NUMBA:
+        total_delays = sim_buffer("net", num_ops, n)
+        block_seeds = RNG.integers(0, 2**32, size=-(-num_ops // ROWS_PER_SEED), dtype=np.uint32)
+        fill_delays_numba(total_delays, disk_mean, disk_std, block_seeds)
+        return total_delays
+
     # 1. Network RTT (One way * 2)
-    net_delays = np.random.normal(NETWORK_MEAN, NETWORK_STD, (num_ops, n))
+    net_delays = sim_buffer("net", num_ops, n)
+    RNG.standard_normal(dtype=SIM_DTYPE, out=net_delays)
+    net_delays *= NETWORK_STD
+    net_delays += NETWORK_MEAN
     # Ensure no negative latencies
-    net_delays = np.maximum(net_delays, 1.0)
+    np.maximum(net_delays, 1.0, out=net_delays)
     
     # 2. Disk Processing
-    if op_type == "write":
-        disk_mean, disk_std = WRITE_DISK_MEAN, WRITE_DISK_STD
-    else:
-        disk_mean, disk_std = READ_DISK_MEAN, READ_DISK_STD
-
-    disk_delays = np.random.normal(disk_mean, disk_std, (num_ops, n))
-    disk_delays = np.maximum(disk_delays, 0.5)
+    disk_delays = sim_buffer("disk", num_ops, n)
+    RNG.standard_normal(dtype=SIM_DTYPE, out=disk_delays)
+    disk_delays *= disk_std
+    disk_delays += disk_mean
+    np.maximum(disk_delays, 0.5, out=disk_delays)
     
     # Total latency for each replica
-    total_delays = net_delays + disk_delays
+    net_delays += disk_delays
+    return net_delays
+
+def draw_failures(total_delays, op_type="write", node_failure_rate=0.0, coord_failure_rate=0.0):
+    """
+    Applies node failures to 'total_delays' in place and draws the per-operation masks.
+    Returns (alive_count, coord_failed, needs_repair); each is None when it cannot trigger.
+    """
+    num_ops, n = total_delays.shape
+    alive_count = None
+    coord_failed = None
+    needs_repair = None
+    if node_failure_rate <= 0.0 and coord_failure_rate <= 0.0:
+        return alive_count, coord_failed, needs_repair
+
+    # One uniform draw covers everything: columns [0, n) decide the replica failures, column n
+    # the coordinator and column n + 1 the read repair
+    draws = sim_buffer("uniform", num_ops, n + 2)
+    RNG.random(dtype=SIM_DTYPE, out=draws)
 
     # 3. Simulate Node Failures
     if node_failure_rate > 0.0:
-        # Generate a mask where True indicates a node failure
-        # We use a random generator for this
-        is_failed = np.random.random((num_ops, n)) < node_failure_rate
-        # Failed nodes do not respond, effectively causing a timeout for that specific path
-        total_delays[is_failed] = TIMEOUT_MS
-    
-    # Sort along the replica axis to find the k-th fastest response
-    # We want the time when the 'quorum_size'-th replica responds
-    total_delays.sort(axis=1)
-    
-    # The latency of the operation is determined by the slowest of the required quorum
-    # Index is quorum_size - 1 because 0-indexed
-    op_latencies = total_delays[:, quorum_size - 1]
-    
-    # Add Fan-out overhead (sending requests takes time)
-    fanout_overhead = n * FANOUT_COST_PER_NODE
-    op_latencies += fanout_overhead
-
-    # Add reconciliation overhead for reads if quorum > 1
-    if op_type == "read" and quorum_size > 1:
-        # Overhead increases slightly with the number of replicas to reconcile
-        overhead = (quorum_size - 1) * READ_RECONCILIATION_BASE
-        op_latencies += overhead
+        node_draws = draws[:, :n]
+        if HAVE_NUMBA:
+            alive_count = mask_failed_numba(total_delays, node_draws, node_failure_rate)
+        else:
+            # Generate a mask where True indicates a node failure
+            is_failed = node_draws < node_failure_rate
+            # Failed nodes do not respond, effectively causing a timeout for that specific path
+            total_delays[is_failed] = TIMEOUT_MS
+            alive_count = n - np.count_nonzero(is_failed, axis=1)
 
     # 4. Simulate Coordinator Failures
     if coord_failure_rate > 0.0:
         # If coordinator fails, client must retry with another node
-        # This adds a fixed retry penalty to the operation
-        coord_failed = np.random.random(num_ops) < coord_failure_rate
-        op_latencies[coord_failed] += CLIENT_RETRY_DELAY
+        coord_failed = draws[:, n] < coord_failure_rate
 
     # 5. Simulate Read Repair (Only for Reads)
     # If nodes are failing/flaky, inconsistencies are likely.
@@ -96,13 +247,330 @@ def simulate_latency(n, quorum_size, op_type="write", num_ops=1000, node_failure
     if op_type == "read" and node_failure_rate > 0.0:
         # Probability of needing repair scales with failure rate
         # If 20% nodes are failing, we assume 20% of reads might encounter stale/missing data requiring fix
-        needs_repair = np.random.random(num_ops) < node_failure_rate
-        
+        needs_repair = draws[:, n + 1] < node_failure_rate
+    return alive_count, coord_failed, needs_repair
+
+def select_quorum_delays(delays, quorum_size):
+    """Returns the 'quorum_size'-th smallest delay of each trial, possibly reordering the rows."""
+    num_ops, n = delays.shape
+    # W=1 and W=N are plain reductions
+    if quorum_size == 1:
+        return delays.min(axis=1)
+    if quorum_size == n:
+        return delays.max(axis=1)
+    if HAVE_NUMBA and n >= HEAP_SELECT_MIN_N and min(quorum_size, n - quorum_size + 1) <= HEAP_SELECT_MAX_SIZE:
+        return kth_smallest_numba(delays, quorum_size)
+    # Partition along the replica axis to find the k-th fastest response
+    # A selection is O(n) per row and the other positions don't need to be ordered; rows must
+    # be contiguous float32 for the vectorized path (a no-op for the simulation buffers)
+    delays = np.ascontiguousarray(delays, dtype=SIM_DTYPE)
+    delays.partition(quorum_size - 1, axis=-1)
+    return delays[:, quorum_size - 1]
+
+def quorum_overhead(n, quorum_size, op_type="write"):
+    """Returns the fixed per-operation cost added on top of the quorum's replica delay."""
+    # Add Fan-out overhead (sending requests takes time)
+    overhead = n * FANOUT_COST_PER_NODE
+
+    # Add reconciliation overhead for reads if quorum > 1
+    if op_type == "read" and quorum_size > 1:
+        # Overhead increases slightly with the number of replicas to reconcile
+        overhead += (quorum_size - 1) * READ_RECONCILIATION_BASE
+    return overhead
+
+def quorum_latency(total_delays, quorum_size, op_type="write", coord_failed=None, needs_repair=None,
+                   alive_count=None):
+    """
+    Returns the average latency of waiting for 'quorum_size' acks, given the replica delays.
+    'total_delays' is reordered along each row but keeps its values, so it can be reused
+    for other quorum sizes. 'alive_count' (from draw_failures) lets trials without
+    enough live replicas skip the selection.
+    """
+    num_ops, n = total_delays.shape
+
+    # Failed replicas sit at TIMEOUT_MS, so a trial with fewer than 'quorum_size' live
+    # replicas always waits out the timeout and doesn't need a selection
+    reachable = None
+    if alive_count is not None:
+        reachable = alive_count >= quorum_size
+        if reachable.all():
+            reachable = None
+
+    # We want the time when the 'quorum_size'-th replica responds
+    if reachable is None:
+        quorum_delays = select_quorum_delays(total_delays, quorum_size)
+    else:
+        quorum_delays = np.full(num_ops, TIMEOUT_MS, dtype=SIM_DTYPE)
+        if reachable.any():
+            quorum_delays[reachable] = select_quorum_delays(total_delays[reachable], quorum_size)
+    
+    # The latency of the operation is determined by the slowest of the required quorum
+    overhead = quorum_overhead(n, quorum_size, op_type)
+
+    # The addition makes a fresh array, so the delays are left intact for the next quorum size
+    op_latencies = quorum_delays + overhead
+
+    # The penalties are added as one linear multiply-add over the masks rather than as
+    # boolean-indexed scatter adds
+    # A failed coordinator adds a fixed client retry penalty to the operation
+    penalties = None
+    if coord_failed is not None:
+        penalties = coord_failed * SIM_DTYPE(CLIENT_RETRY_DELAY)
+
+    if needs_repair is not None:
         # Repair cost: Network RTT + Disk Write (to update the stale node)
-        repair_cost = NETWORK_MEAN + WRITE_DISK_MEAN
-        op_latencies[needs_repair] += repair_cost
+        repair_cost = needs_repair * SIM_DTYPE(NETWORK_MEAN + WRITE_DISK_MEAN)
+        penalties = repair_cost if penalties is None else penalties + repair_cost
+
+    if penalties is not None:
+        op_latencies += penalties
 
-    return np.mean(op_latencies)
+    return np.mean(op_latencies, dtype=np.float64)
+
+def seed_config(*config):
+    """Reseeds RNG (and CuPy's stream) from SEED and the given config arguments."""
+    global RNG
+    # A stable digest rather than hash(), which is salted per process for strings
+    digest = hashlib.sha256(repr(config).encode()).digest()
+    seed = np.random.SeedSequence([SEED, int.from_bytes(digest[:16], "little")])
+    # The Numba kernels draw their block seeds from RNG, so this covers them as well
+    RNG = np.random.default_rng(seed)
+    if HAVE_CUPY:
+        cp.random.seed(int(seed.generate_state(1)[0]))
+
+def simulate_latency(n, quorum_size, op_type="write", num_ops=1000, node_failure_rate=0.0, coord_failure_rate=0.0):
+    """
+    Simulates the latency of an operation that requires 'quorum_size' acks from 'n' replicas.
+    Returns the average latency over num_ops.
+    """
+    # Checked outside the cache, so flipping the flag never returns a cached Monte Carlo result
+    if ANALYTICAL_MODEL:
+        return analytical_latency(n, quorum_size, op_type, node_failure_rate, coord_failure_rate)
+    return monte_carlo_latency(n, quorum_size, op_type, num_ops, node_failure_rate, coord_failure_rate)
+
+# Repeated configs (re-runs in the same process, duplicate quorum sizes) reuse their first
+# result instead of drawing again
+@functools.lru_cache(maxsize=512)
+def monte_carlo_latency(n, quorum_size, op_type, num_ops, node_failure_rate, coord_failure_rate):
+    """Monte Carlo half of simulate_latency."""
+    seed_config("latency", n, quorum_size, op_type, num_ops, node_failure_rate, coord_failure_rate)
+    total_delays = draw_replica_delays(n, num_ops, op_type)
+    alive_count, coord_failed, needs_repair = draw_failures(total_delays, op_type, node_failure_rate,
+                                                            coord_failure_rate)
+    return quorum_latency(total_delays, quorum_size, op_type, coord_failed, needs_repair, alive_count)
+
+def analytical_latency(n, quorum_size, op_type="write", node_failure_rate=0.0, coord_failure_rate=0.0):
+    """
+    Approximates simulate_latency in closed form, without drawing any samples.
+    Each replica answers after a Gaussian network + disk delay, or times out if failed.
+    """
+    if op_type == "write":
+        disk_mean, disk_std = WRITE_DISK_MEAN, WRITE_DISK_STD
+    else:
+        disk_mean, disk_std = READ_DISK_MEAN, READ_DISK_STD
+    # The 1.0/0.5 clamps sit 4 standard deviations out, so the sum is treated as Gaussian
+    delay = NormalDist(NETWORK_MEAN + disk_mean, math.hypot(NETWORK_STD, disk_std))
+
+    # Condition on the number of live replicas m ~ Binomial(n, 1 - p): with m < k the quorum
+    # waits out TIMEOUT_MS, otherwise it is the k-th of m Gaussians (Blom's approximation)
+    p = node_failure_rate
+    alive = range(quorum_size, n + 1) if p > 0.0 else [n]
+    expected = 0.0
+    reachable = 0.0
+    for m in alive:
+        if p > 0.0:
+            # In log space, since comb(n, m) overflows a float for very large n
+            weight = math.exp(math.lgamma(n + 1) - math.lgamma(m + 1) - math.lgamma(n - m + 1)
+                              + m * math.log1p(-p) + (n - m) * math.log(p))
+        else:
+            weight = 1.0
+        expected += weight * delay.inv_cdf((quorum_size - 0.375) / (m + 0.25))
+        reachable += weight
+    expected += (1.0 - reachable) * TIMEOUT_MS
+
+    # Same overheads and penalties as quorum_latency, taken in expectation
+    expected += quorum_overhead(n, quorum_size, op_type)
+    expected += coord_failure_rate * CLIENT_RETRY_DELAY
+    if op_type == "read" and node_failure_rate > 0.0:
+        expected += node_failure_rate * (NETWORK_MEAN + WRITE_DISK_MEAN)
+    return expected
+
+def simulate_quorum_grid(n, quorum_sizes, op_type, failure_rates, num_ops=1000, coord_failure_rate=0.0):
+    """
+    Simulates every (quorum_size, failure_rate) pair for 'n' replicas.
+    Takes the sizes and rates as tuples and returns latencies[i][j] for quorum_sizes[i] and
+    failure_rates[j], as a tuple of tuples since results are shared through the cache.
+    """
+    if ANALYTICAL_MODEL:
+        return tuple(tuple(analytical_latency(n, k, op_type, fr, coord_failure_rate) for fr in failure_rates)
+                     for k in quorum_sizes)
+    return monte_carlo_quorum_grid(n, quorum_sizes, op_type, failure_rates, num_ops, coord_failure_rate)
+
+@functools.lru_cache(maxsize=512)
+def monte_carlo_quorum_grid(n, quorum_sizes, op_type, failure_rates, num_ops, coord_failure_rate):
+    """Monte Carlo half of simulate_quorum_grid."""
+    seed_config("grid", n, quorum_sizes, op_type, failure_rates, num_ops, coord_failure_rate)
+    if HAVE_CUPY and n >= GPU_MIN_N:
+        grid = simulate_quorum_grid_gpu(n, quorum_sizes, op_type, failure_rates, num_ops, coord_failure_rate)
+        return tuple(map(tuple, grid))
+    # The healthy replica delays are drawn once and shared by every failure rate, and each
+    # failure rate's masks are shared by every quorum size; only the selection is per config
+    base_delays = draw_replica_delays(n, num_ops, op_type)
+    latencies = [[] for _ in quorum_sizes]
+    for fr in failure_rates:
+        if fr > 0.0:
+            total_delays = sim_buffer("failed", num_ops, n)
+            np.copyto(total_delays, base_delays)
+        else:
+            # Nothing gets masked, so the (row-permuted) healthy delays can be used directly
+            total_delays = base_delays
+        alive_count, coord_failed, needs_repair = draw_failures(total_delays, op_type, fr, coord_failure_rate)
+        for i, k in enumerate(quorum_sizes):
+            latencies[i].append(quorum_latency(total_delays, k, op_type, coord_failed, needs_repair,
+                                               alive_count))
+    return tuple(map(tuple, latencies))
+
+def simulate_all_k(n, op_type="write", num_ops=1000, node_failure_rate=0.0, coord_failure_rate=0.0):
+    """
+    Simulates every quorum size k = 1..n from a single draw.
+    Returns an array whose [k - 1] entry is the average latency for quorum size k.
+    """
+    if ANALYTICAL_MODEL:
+        return np.array([analytical_latency(n, k, op_type, node_failure_rate, coord_failure_rate)
+                         for k in range(1, n + 1)])
+    total_delays = draw_replica_delays(n, num_ops, op_type)
+    alive_count, coord_failed, needs_repair = draw_failures(total_delays, op_type, node_failure_rate,
+                                                            coord_failure_rate)
+
+    # One full sort orders every position at once: column k - 1 holds each trial's k-th
+    # fastest response, so the column means are the quorum latencies for all k
+    total_delays.sort(axis=1)
+    means = total_delays.mean(axis=0, dtype=np.float64)
+
+    # Fan-out overhead, plus the read reconciliation overhead of (k - 1) extra replicas
+    means += n * FANOUT_COST_PER_NODE
+    if op_type == "read":
+        means += np.arange(n) * READ_RECONCILIATION_BASE
+
+    # The penalties don't depend on k, so their mean applies to every entry
+    if coord_failed is not None:
+        means += coord_failed.mean() * CLIENT_RETRY_DELAY
+    if needs_repair is not None:
+        means += needs_repair.mean() * (NETWORK_MEAN + WRITE_DISK_MEAN)
+    return means
+
+def simulate_quorum_grid_gpu(n, quorum_sizes, op_type, failure_rates, num_ops=1000, coord_failure_rate=0.0):
+    """
+    Same model and result layout as simulate_quorum_grid, with the arrays kept on the GPU.
+    Only the per-config means are copied back to the host.
+    """
+    if op_type == "write":
+        disk_mean, disk_std = WRITE_DISK_MEAN, WRITE_DISK_STD
+    else:
+        disk_mean, disk_std = READ_DISK_MEAN, READ_DISK_STD
+
+    # 1. Network RTT and 2. Disk Processing, clamped as on the host
+    base_delays = cp.random.standard_normal((num_ops, n), dtype=SIM_DTYPE)
+    base_delays *= NETWORK_STD
+    base_delays += NETWORK_MEAN
+    cp.maximum(base_delays, 1.0, out=base_delays)
+    disk_delays = cp.random.standard_normal((num_ops, n), dtype=SIM_DTYPE)
+    disk_delays *= disk_std
+    disk_delays += disk_mean
+    cp.maximum(disk_delays, 0.5, out=disk_delays)
+    base_delays += disk_delays
+
+    latencies = [[] for _ in quorum_sizes]
+    for fr in failure_rates:
+        # 3. Node Failures
+        total_delays = base_delays
+        if fr > 0.0:
+            is_failed = cp.random.random((num_ops, n), dtype=SIM_DTYPE) < fr
+            total_delays = cp.where(is_failed, SIM_DTYPE(TIMEOUT_MS), base_delays)
+
+        # 4. Coordinator Failures and 5. Read Repair
+        penalties = cp.zeros(num_ops, dtype=SIM_DTYPE)
+        if coord_failure_rate > 0.0:
+            coord_failed = cp.random.random(num_ops, dtype=SIM_DTYPE) < coord_failure_rate
+            penalties += coord_failed * SIM_DTYPE(CLIENT_RETRY_DELAY)
+        if op_type == "read" and fr > 0.0:
+            needs_repair = cp.random.random(num_ops, dtype=SIM_DTYPE) < fr
+            penalties += needs_repair * SIM_DTYPE(NETWORK_MEAN + WRITE_DISK_MEAN)
+
+        for i, k in enumerate(quorum_sizes):
+            quorum_delays = cp.partition(total_delays, k - 1, axis=1)[:, k - 1]
+            mean_latency = float((quorum_delays + penalties).mean(dtype=cp.float64))
+            latencies[i].append(mean_latency + quorum_overhead(n, k, op_type))
+    return latencies
+
+def simulate_configs(configs, quorum_key, op_type, num_ops=1000):
+    """
+    Simulates the healthy-cluster latency of each {"N": n, quorum_key: k} config.
+    Returns a dict mapping (n, k) to the average latency.
+    """
+    # Configs sharing N reuse one draw of the replica delays
+    latencies = {}
+    for n in dict.fromkeys(cfg["N"] for cfg in configs):
+        # Duplicate quorum sizes of an N are only simulated once
+        quorum_sizes = tuple(dict.fromkeys(cfg[quorum_key] for cfg in configs if cfg["N"] == n))
+        if len(quorum_sizes) >= math.log2(n):
+            # Sweeping (nearly) every k: one O(n log n) sort beats a partition per k
+            means = simulate_all_k(n, op_type, num_ops=num_ops)
+            for k in quorum_sizes:
+                latencies[(n, k)] = means[k - 1]
+            continue
+        grid = simulate_quorum_grid(n, quorum_sizes, op_type, (0.0,), num_ops=num_ops)
+        for k, series in zip(quorum_sizes, grid):
+            latencies[(n, k)] = series[0]
+    return latencies
+
+def init_sim_worker():
+    """Pins each pool worker to one Numba thread, since the pool already spreads configs over the cores."""
+    if HAVE_NUMBA:
+        set_num_threads(1)
+
+def run_quorum_grid_task(task):
+    """Runs one simulate_quorum_grid task in a pool worker."""
+    # simulate_quorum_grid seeds itself from the task's arguments, so the result does not
+    # depend on which worker runs it
+    return simulate_quorum_grid(*task)
+
+def get_pyplot():
+    """Imports pyplot on first use, so library use and pool workers skip the matplotlib import."""
+    import matplotlib
+    # Graphs are only written to files, so skip the interactive GUI backend
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def plot_series(labels, values, color, title, ylabel, filename, value_fmt, annotate_at):
+    """Saves one per-config line graph, labelling the points in annotate_at, and closes its figure."""
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(20, 10))  # Increased figure size for more labels
+    ax.plot(labels, values, marker='o', linestyle='-', color=color, linewidth=2, markersize=6)
+    
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    plt.setp(ax.get_xticklabels(), rotation=90, ha='center', fontsize=8)  # Rotate labels 90 deg for density
+    
+    # Add value labels only for selected points to avoid clutter
+    for i in annotate_at:
+        ax.annotate(value_fmt(values[i]),
+                    xy=(labels[i], values[i]),
+                    xytext=(0, 10),  # 10 points vertical offset
+                    textcoords="offset points",
+                    ha='center', va='bottom',
+                    fontsize=8,
+                    fontweight='bold')
+    
+    fig.tight_layout()  # Adjust layout to prevent clipping
+    fig.savefig(filename)
+    plt.close(fig)
+
+def annotated_points(count):
+    """Indexes of the points to label: every 3rd one plus the last."""
+    return [i for i in range(count) if i % 3 == 0 or i == count - 1]
 
 def run_million_keys_simulation():
     print("\n🚀 Starting Million-Key Insertion Simulation")
@@ -129,20 +597,20 @@ def run_million_keys_simulation():
     
     results = []
     
+    # We simulate the latency for the entire batch of 1 million keys
+    # Since simulating 1M individual random variables is heavy, we do it in chunks
+    # or just simulate the average latency and extrapolate.
+    # For accuracy, let's simulate a representative sample and extrapolate.
+    sample_size = 10000
+    latencies = simulate_configs(configs, "W", "write", num_ops=sample_size)
+    
     for cfg in configs:
         n = cfg["N"]
         w = cfg["W"]
         label = cfg["label"]
         
         print(f"\nTesting Configuration: {label}")
-        
-        # We simulate the latency for the entire batch of 1 million keys
-        # Since simulating 1M individual random variables is heavy, we do it in chunks
-        # or just simulate the average latency and extrapolate.
-        # For accuracy, let's simulate a representative sample and extrapolate.
-        
-        sample_size = 10000
-        avg_latency_ms = simulate_latency(n, w, op_type="write", num_ops=sample_size)
+        avg_latency_ms = latencies[(n, w)]
         
         # Throughput calculation
         # If we have infinite concurrency, throughput is limited by hardware.
@@ -166,56 +634,18 @@ def run_million_keys_simulation():
     # Plotting
     labels = [r["label"] for r in results]
     times = [r["total_time"] for r in results]
+    throughputs = [r["throughput"] for r in results]
+    annotate_at = annotated_points(len(results))
     
-    plt.figure(figsize=(20, 10))  # Increased figure size for more labels
-    # Changed to line graph as requested
-    plt.plot(labels, times, marker='o', linestyle='-', color='#4682B4', linewidth=2, markersize=6)
-    
-    plt.title(f'Time to Insert {NUM_KEYS:,} Keys (Cluster Size={CLUSTER_SIZE})')
-    plt.ylabel('Total Time (Seconds)')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.xticks(rotation=90, ha='center', fontsize=8)  # Rotate labels 90 deg for density
-    
-    # Add value labels only for selected points to avoid clutter
-    for i, time_val in enumerate(times):
-        # Label every 3rd point or if it's an extreme value
-        if i % 3 == 0 or i == len(times) - 1:
-            plt.annotate(f'{time_val:.1f}s',
-                        xy=(labels[i], time_val),
-                        xytext=(0, 10),  # 10 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8,
-                        fontweight='bold')
-    
-    plt.tight_layout()  # Adjust layout to prevent clipping
+    # Line graph
     filename = "graph_million_keys_time.png"
-    plt.savefig(filename)
+    plot_series(labels, times, '#4682B4', f'Time to Insert {NUM_KEYS:,} Keys (Cluster Size={CLUSTER_SIZE})',
+                'Total Time (Seconds)', filename, lambda v: f'{v:.1f}s', annotate_at)
     print(f"\n✅ Graph saved to {filename}")
 
     # Plotting Throughput
-    throughputs = [r["throughput"] for r in results]
-    
-    plt.figure(figsize=(20, 10))
-    plt.plot(labels, throughputs, marker='o', linestyle='-', color='#2ECC71', linewidth=2, markersize=6)
-    
-    plt.title(f'Write Throughput (Cluster Size={CLUSTER_SIZE})')
-    plt.ylabel('Throughput (Ops/Sec)')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.xticks(rotation=90, ha='center', fontsize=8)
-    
-    for i, val in enumerate(throughputs):
-        if i % 3 == 0 or i == len(throughputs) - 1:
-            plt.annotate(f'{int(val)}',
-                        xy=(labels[i], val),
-                        xytext=(0, 10),
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8,
-                        fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig("graph_million_keys_throughput.png")
+    plot_series(labels, throughputs, '#2ECC71', f'Write Throughput (Cluster Size={CLUSTER_SIZE})',
+                'Throughput (Ops/Sec)', "graph_million_keys_throughput.png", lambda v: f'{int(v)}', annotate_at)
     print("✅ Write Throughput Graph saved to graph_million_keys_throughput.png")
 
 def run_read_simulation():
@@ -240,15 +670,16 @@ def run_read_simulation():
     
     results = []
     
+    # We use the same simulation as for writes because the logic 
+    # (waiting for K responses from N nodes) is identical for R and W in this model.
+    sample_size = 10000
+    latencies = simulate_configs(configs, "R", "read", num_ops=sample_size)
+    
     for cfg in configs:
         n = cfg["N"]
         r = cfg["R"]
         label = cfg["label"]
-        
-        # We use the same simulate_latency function because the logic 
-        # (waiting for K responses from N nodes) is identical for R and W in this model.
-        sample_size = 10000
-        avg_latency_ms = simulate_latency(n, r, op_type="read", num_ops=sample_size)
+        avg_latency_ms = latencies[(n, r)]
         
         concurrency = 100
         ops_per_sec = (1000 / avg_latency_ms) * concurrency
@@ -263,83 +694,72 @@ def run_read_simulation():
     # Plotting
     labels = [r["label"] for r in results]
     times = [r["total_time"] for r in results]
+    throughputs = [r["throughput"] for r in results]
+    annotate_at = annotated_points(len(results))
     
-    plt.figure(figsize=(20, 10))
     # Using a different color (Orange) for Read operations
-    plt.plot(labels, times, marker='o', linestyle='-', color='#E67E22', linewidth=2, markersize=6)
-    
-    plt.title(f'Time to Read {NUM_KEYS:,} Keys (Cluster Size={CLUSTER_SIZE})')
-    plt.ylabel('Total Time (Seconds)')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.xticks(rotation=90, ha='center', fontsize=8)
-    
-    for i, time_val in enumerate(times):
-        if i % 3 == 0 or i == len(times) - 1:
-            plt.annotate(f'{time_val:.1f}s',
-                        xy=(labels[i], time_val),
-                        xytext=(0, 10),
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8,
-                        fontweight='bold')
-    
-    plt.tight_layout()
     filename = "graph_million_reads_time.png"
-    plt.savefig(filename)
+    plot_series(labels, times, '#E67E22', f'Time to Read {NUM_KEYS:,} Keys (Cluster Size={CLUSTER_SIZE})',
+                'Total Time (Seconds)', filename, lambda v: f'{v:.1f}s', annotate_at)
     print(f"\n✅ Read Graph saved to {filename}")
 
     # Plotting Throughput
-    throughputs = [r["throughput"] for r in results]
-    
-    plt.figure(figsize=(20, 10))
-    plt.plot(labels, throughputs, marker='o', linestyle='-', color='#9B59B6', linewidth=2, markersize=6)
-    
-    plt.title(f'Read Throughput (Cluster Size={CLUSTER_SIZE})')
-    plt.ylabel('Throughput (Ops/Sec)')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.xticks(rotation=90, ha='center', fontsize=8)
-    
-    for i, val in enumerate(throughputs):
-        if i % 3 == 0 or i == len(throughputs) - 1:
-            plt.annotate(f'{int(val)}',
-                        xy=(labels[i], val),
-                        xytext=(0, 10),
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8,
-                        fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig("graph_million_reads_throughput.png")
+    plot_series(labels, throughputs, '#9B59B6', f'Read Throughput (Cluster Size={CLUSTER_SIZE})',
+                'Throughput (Ops/Sec)', "graph_million_reads_throughput.png", lambda v: f'{int(v)}', annotate_at)
     print("✅ Read Throughput Graph saved to graph_million_reads_throughput.png")
 
+def plot_failure_results(results, failure_rates, title, ylabel, filename):
+    """Saves one line per quorum size against the node failure rate, and closes the figure."""
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    # Use a colormap for distinct lines
+    colors = plt.cm.viridis(np.linspace(0, 0.9, len(results)))
+    x_labels = [f"{fr*100:.0f}%" for fr in failure_rates]
+    
+    for idx, res in enumerate(results):
+        ax.plot(x_labels, res["data"], marker='o', linewidth=2, label=res["label"], color=colors[idx])
+
+    ax.set_title(title)
+    ax.set_xlabel('Node Failure Rate (%)')
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+    print(f"✅ Saved {filename}")
+
 def run_failure_impact_simulation():
     n_values = [20, 50, 100]
     failure_rates = [0.0, 0.05, 0.10, 0.20] # 0%, 5%, 10%, 20% node failure
     
+    # Define W and R values: 1, ~25%, Majority, ~75%, All
+    # We use a set to avoid duplicates and sorted to keep order
+    # Filter out 0 or invalid values just in case
+    quorum_values = {}
     for n in n_values:
-        print(f"\n🚀 Starting Failure Impact Simulation (N={n})")
-        print(f"   Cluster Size: {CLUSTER_SIZE} nodes")
-        
-        # Define W and R values: 1, ~25%, Majority, ~75%, All
-        # We use a set to avoid duplicates and sorted to keep order
         w_values = sorted(list(set([1, int(n*0.25), (n//2)+1, int(n*0.75), n])))
-        # Filter out 0 or invalid values just in case
-        w_values = [x for x in w_values if x > 0]
+        quorum_values[n] = [x for x in w_values if x > 0]
+
+    # Every (N, op_type) grid is independent and CPU-bound, so they run in a process pool
+    tasks = [(n, tuple(quorum_values[n]), op_type, tuple(failure_rates), 2000, 0.01)
+             for n in n_values for op_type in ("write", "read")]
+    print(f"\n🚀 Simulating {len(tasks)} failure impact grids in parallel")
+    # Workers are spawned rather than forked: forking after Numba's thread pool has started
+    # (e.g. a previous simulation ran in this process) can leave the children deadlocked
+    with ProcessPoolExecutor(initializer=init_sim_worker, mp_context=multiprocessing.get_context("spawn")) as pool:
+        grids = dict(zip([(t[0], t[2]) for t in tasks], pool.map(run_quorum_grid_task, tasks)))
+    
+    for n in n_values:
+        print(f"\n🚀 Failure Impact Simulation (N={n})")
+        print(f"   Cluster Size: {CLUSTER_SIZE} nodes")
+        w_values = quorum_values[n]
         
         # 1. Write Simulation
         write_throughput_results = []
         write_latency_results = []
-        print(f"   --- Simulating Writes (N={n}) ---")
-        for w in w_values:
-            w_throughput_series = []
-            w_latency_series = []
-            for fr in failure_rates:
-                avg_latency = simulate_latency(n, w, op_type="write", num_ops=2000, 
-                                             node_failure_rate=fr, coord_failure_rate=0.01)
-                throughput = (1000 / avg_latency) * 100
-                w_throughput_series.append(throughput)
-                w_latency_series.append(avg_latency)
+        for w, w_latency_series in zip(w_values, grids[(n, "write")]):
+            w_throughput_series = [(1000 / avg_latency) * 100 for avg_latency in w_latency_series]
             write_throughput_results.append({"label": f"W={w}", "data": w_throughput_series})
             write_latency_results.append({"label": f"W={w}", "data": w_latency_series})
 
@@ -348,53 +768,20 @@ def run_failure_impact_simulation():
         r_values = w_values
         read_throughput_results = []
         read_latency_results = []
-        print(f"   --- Simulating Reads (N={n}) ---")
-        for r in r_values:
-            r_throughput_series = []
-            r_latency_series = []
-            for fr in failure_rates:
-                avg_latency = simulate_latency(n, r, op_type="read", num_ops=2000, 
-                                             node_failure_rate=fr, coord_failure_rate=0.01)
-                throughput = (1000 / avg_latency) * 100
-                r_throughput_series.append(throughput)
-                r_latency_series.append(avg_latency)
+        for r, r_latency_series in zip(r_values, grids[(n, "read")]):
+            r_throughput_series = [(1000 / avg_latency) * 100 for avg_latency in r_latency_series]
             read_throughput_results.append({"label": f"R={r}", "data": r_throughput_series})
             read_latency_results.append({"label": f"R={r}", "data": r_latency_series})
 
-        # Plotting Helper
-        def plot_results(results, title, ylabel, filename):
-            plt.figure(figsize=(10, 6))
-            # Use a colormap for distinct lines
-            colors = plt.cm.viridis(np.linspace(0, 0.9, len(results)))
-            
-            for idx, res in enumerate(results):
-                plt.plot([f"{fr*100:.0f}%" for fr in failure_rates], res["data"], 
-                        marker='o', linewidth=2, label=res["label"], color=colors[idx])
-
-            plt.title(title)
-            plt.xlabel('Node Failure Rate (%)')
-            plt.ylabel(ylabel)
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.legend()
-            plt.tight_layout()
-            plt.savefig(filename)
-            print(f"✅ Saved {filename}")
-
         # Plot Throughput
-        plot_results(write_throughput_results, f'Impact of Failures on Write Throughput (N={n})', 'Throughput (Ops/Sec)', f"graph_failure_impact_write_throughput_Cluster{CLUSTER_SIZE}_N{n}.png")
-        plot_results(read_throughput_results, f'Impact of Failures on Read Throughput (N={n})', 'Throughput (Ops/Sec)', f"graph_failure_impact_read_throughput_Cluster{CLUSTER_SIZE}_N{n}.png")
+        plot_failure_results(write_throughput_results, failure_rates, f'Impact of Failures on Write Throughput (N={n})', 'Throughput (Ops/Sec)', f"graph_failure_impact_write_throughput_Cluster{CLUSTER_SIZE}_N{n}.png")
+        plot_failure_results(read_throughput_results, failure_rates, f'Impact of Failures on Read Throughput (N={n})', 'Throughput (Ops/Sec)', f"graph_failure_impact_read_throughput_Cluster{CLUSTER_SIZE}_N{n}.png")
         
         # Plot Latency
-        plot_results(write_latency_results, f'Impact of Failures on Write Latency (N={n})', 'Latency (ms)', f"graph_failure_impact_write_latency_Cluster{CLUSTER_SIZE}_N{n}.png")
-        plot_results(read_latency_results, f'Impact of Failures on Read Latency (N={n})', 'Latency (ms)', f"graph_failure_impact_read_latency_Cluster{CLUSTER_SIZE}_N{n}.png")
-
-if __name__ == "__main__":
-    # run_million_keys_simulation()
-    # run_read_simulation()
-    run_failure_impact_simulation()
+        plot_failure_results(write_latency_results, failure_rates, f'Impact of Failures on Write Latency (N={n})', 'Latency (ms)', f"graph_failure_impact_write_latency_Cluster{CLUSTER_SIZE}_N{n}.png")
+        plot_failure_results(read_latency_results, failure_rates, f'Impact of Failures on Read Latency (N={n})', 'Latency (ms)', f"graph_failure_impact_read_latency_Cluster{CLUSTER_SIZE}_N{n}.png")
 
 if __name__ == "__main__":
-    # run_theoretical_benchmark() # Commented out
     # run_million_keys_simulation()
     # run_read_simulation()
     run_failure_impact_simulation()
